@@ -0,0 +1,41 @@
+"""Gunicorn settings for running the AI engine in production.
+
+Detection is CPU-bound Python, so throughput scales with processes rather
+than concurrency within one event loop.
+"""
+
+import math
+import os
+
+
+def _available_cpus() -> int:
+    """CPUs this process may run on, within its affinity mask and cgroup quota.
+
+    ``os.cpu_count()`` reports every core on the host, even in a container
+    limited to a few of them.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    # Container CPU limits (e.g. Kubernetes resources.limits.cpu) are a cgroup
+    # v2 quota rather than an affinity mask.
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+bind = os.environ.get("QSGW_AI_BIND", "0.0.0.0:8086")
+# One worker per available CPU by default: the handlers never wait on I/O, so
+# extra workers beyond that only add contention.
+workers = int(os.environ.get("WEB_CONCURRENCY", _available_cpus()))
+# uvicorn picks uvloop and httptools automatically when they are installed.
+worker_class = "uvicorn_worker.UvicornWorker"
+# Import the app (and build the detectors) once in the master process so
+# forked workers share it copy-on-write.
+preload_app = True
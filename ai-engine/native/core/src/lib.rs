@@ -0,0 +1,81 @@
+//! User-agent pattern matching for the QSGW AI engine.
+//!
+//! Kept free of Python bindings so it can be built and tested with plain
+//! `cargo test`; the `qsgw-detect` crate wraps it for Python.
+
+use aho_corasick::{AhoCorasick, AhoCorasickBuilder};
+
+pub use aho_corasick::BuildError;
+
+/// ASCII case-insensitive matcher over a fixed set of lowercase patterns.
+pub struct Matcher {
+    automaton: AhoCorasick,
+}
+
+impl Matcher {
+    /// Build a matcher for `patterns`.
+    pub fn new<P: AsRef<[u8]>>(patterns: &[P]) -> Result<Self, BuildError> {
+        let automaton = AhoCorasickBuilder::new()
+            .ascii_case_insensitive(true)
+            .build(patterns)?;
+        Ok(Self { automaton })
+    }
+
+    /// Index of the pattern whose match ends first in `haystack`, if any.
+    ///
+    /// `haystack` need not be valid UTF-8; case folding applies to ASCII
+    /// letters only.
+    ///
+    /// This is the same match `pyahocorasick` reports first, so both
+    /// backends produce identical results.
+    pub fn find<H: AsRef<[u8]>>(&self, haystack: H) -> Option<usize> {
+        self.automaton
+            .find(haystack.as_ref())
+            .map(|m| m.pattern().as_usize())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    const PATTERNS: [&str; 3] = ["bot", "curl", "python-requests"];
+
+    #[test]
+    fn finds_pattern_case_insensitively() {
+        let matcher = Matcher::new(&PATTERNS).unwrap();
+        assert_eq!(matcher.find("Googlebot/2.1"), Some(0));
+        assert_eq!(matcher.find("CURL/8.4.0"), Some(1));
+    }
+
+    #[test]
+    fn reports_earliest_ending_match() {
+        // pyahocorasick yields (14, "python-requests") first for this input.
+        let matcher = Matcher::new(&PATTERNS).unwrap();
+        assert_eq!(matcher.find("python-requests bot"), Some(2));
+        assert_eq!(matcher.find("curl python-requests"), Some(1));
+    }
+
+    #[test]
+    fn earliest_end_wins_over_earliest_start() {
+        // "python-requests" starts first but "bot" ends first.
+        let matcher = Matcher::new(&PATTERNS).unwrap();
+        assert_eq!(matcher.find("python-reqbot-uests python-requests"), Some(0));
+    }
+
+    #[test]
+    fn matches_around_invalid_utf8() {
+        // A lone surrogate encoded with Python's "surrogatepass" handler.
+        let matcher = Matcher::new(&PATTERNS).unwrap();
+        assert_eq!(matcher.find(b"\xed\xb2\x80curl"), Some(1));
+    }
+
+    #[test]
+    fn no_match_for_browser_agent() {
+        let matcher = Matcher::new(&PATTERNS).unwrap();
+        assert_eq!(
+            matcher.find("Mozilla/5.0 (Windows NT 10.0) Chrome/120"),
+            None
+        );
+    }
+}
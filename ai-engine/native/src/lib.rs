@@ -0,0 +1,238 @@
+//! Native user-agent pattern matching for the QSGW AI engine.
+//!
+//! Exposes `qsgw_detect.PatternMatcher` to Python, a multi-pattern substring
+//! matcher backed by the `aho-corasick` crate, which uses SIMD prefilters
+//! (Teddy) where the CPU supports them. `BotDetector` uses it in place of
+//! `pyahocorasick` when this extension is installed. The matcher itself lives
+//! in the `qsgw-detect-core` crate; this crate is only the CPython binding,
+//! written against `pyo3-ffi` (PyO3's C-API layer), as orjson does. The type
+//! has a constructor and one method, so the high-level `pyo3` crate and its
+//! proc macros would add build time without removing much code.
+
+use std::ffi::{c_int, c_uint, c_void, CString};
+use std::{mem, ptr, slice};
+
+use pyo3_ffi::*;
+use qsgw_detect_core::Matcher;
+
+/// Instance layout of `qsgw_detect.PatternMatcher`.
+#[repr(C)]
+struct PatternMatcher {
+    ob_base: PyObject,
+    matcher: *mut Matcher,
+    // Tuple of the pattern `str` objects, so a hit returns a new reference
+    // rather than a copy.
+    patterns: *mut PyObject,
+}
+
+/// Borrow the UTF-8 form of a `str`, or return None with an exception set.
+unsafe fn utf8_bytes<'a>(text: *mut PyObject) -> Option<&'a [u8]> {
+    let mut len: Py_ssize_t = 0;
+    // SAFETY: `text` is a `str`; the buffer is cached on it and lives as long
+    // as the object does.
+    unsafe {
+        let data = PyUnicode_AsUTF8AndSize(text, &mut len);
+        if data.is_null() {
+            return None;
+        }
+        Some(slice::from_raw_parts(data.cast::<u8>(), len as usize))
+    }
+}
+
+/// Build a matcher from a tuple of `str`, or set a Python exception.
+unsafe fn build_matcher(patterns: *mut PyObject) -> Option<Matcher> {
+    // SAFETY: `patterns` is a tuple, and the caller holds the GIL.
+    unsafe {
+        let len = PyTuple_Size(patterns);
+        let mut bytes = Vec::with_capacity(len as usize);
+        for i in 0..len {
+            let pattern = PyTuple_GET_ITEM(patterns, i);
+            if PyUnicode_Check(pattern) == 0 {
+                PyErr_SetString(PyExc_TypeError, c"patterns must be str".as_ptr());
+                return None;
+            }
+            bytes.push(utf8_bytes(pattern)?);
+        }
+        match Matcher::new(&bytes) {
+            Ok(matcher) => Some(matcher),
+            Err(err) => {
+                let msg = CString::new(err.to_string()).unwrap_or_default();
+                PyErr_SetString(PyExc_ValueError, msg.as_ptr());
+                None
+            }
+        }
+    }
+}
+
+/// `PatternMatcher(patterns)`
+unsafe extern "C" fn pattern_matcher_new(
+    subtype: *mut PyTypeObject,
+    args: *mut PyObject,
+    kwds: *mut PyObject,
+) -> *mut PyObject {
+    // SAFETY: called by CPython with a valid argument tuple and the GIL held.
+    unsafe {
+        if PyTuple_Size(args) != 1 || (!kwds.is_null() && PyDict_Size(kwds) != 0) {
+            PyErr_SetString(
+                PyExc_TypeError,
+                c"PatternMatcher() takes exactly one positional argument".as_ptr(),
+            );
+            return ptr::null_mut();
+        }
+        let patterns = PySequence_Tuple(PyTuple_GET_ITEM(args, 0));
+        if patterns.is_null() {
+            return ptr::null_mut();
+        }
+        let Some(matcher) = build_matcher(patterns) else {
+            Py_DECREF(patterns);
+            return ptr::null_mut();
+        };
+        let obj = PyType_GenericAlloc(subtype, 0);
+        if obj.is_null() {
+            Py_DECREF(patterns);
+            return ptr::null_mut();
+        }
+        let this = obj.cast::<PatternMatcher>();
+        (*this).matcher = Box::into_raw(Box::new(matcher));
+        (*this).patterns = patterns;
+        obj
+    }
+}
+
+/// `PatternMatcher.find(haystack)`: the first pattern found, or `None`.
+unsafe extern "C" fn pattern_matcher_find(
+    slf: *mut PyObject,
+    haystack: *mut PyObject,
+) -> *mut PyObject {
+    // SAFETY: `slf` is a `PatternMatcher` built by `pattern_matcher_new`, and
+    // the GIL is held.
+    unsafe {
+        if PyUnicode_Check(haystack) == 0 {
+            PyErr_SetString(PyExc_TypeError, c"find() argument must be str".as_ptr());
+            return ptr::null_mut();
+        }
+        let this = slf.cast::<PatternMatcher>();
+        let matcher = &*(*this).matcher;
+        let found = match utf8_bytes(haystack) {
+            Some(bytes) => matcher.find(bytes),
+            None => {
+                // Lone surrogates have no UTF-8 form. Encode them as-is; they
+                // become non-ASCII bytes that cannot affect an ASCII match.
+                PyErr_Clear();
+                let encoded = PyUnicode_AsEncodedString(
+                    haystack,
+                    c"utf-8".as_ptr(),
+                    c"surrogatepass".as_ptr(),
+                );
+                if encoded.is_null() {
+                    return ptr::null_mut();
+                }
+                let bytes = slice::from_raw_parts(
+                    PyBytes_AsString(encoded).cast::<u8>(),
+                    PyBytes_Size(encoded) as usize,
+                );
+                let found = matcher.find(bytes);
+                Py_DECREF(encoded);
+                found
+            }
+        };
+        match found {
+            Some(index) => Py_NewRef(PyTuple_GET_ITEM((*this).patterns, index as Py_ssize_t)),
+            None => Py_NewRef(Py_None()),
+        }
+    }
+}
+
+unsafe extern "C" fn pattern_matcher_dealloc(slf: *mut PyObject) {
+    // SAFETY: called once by CPython when the last reference is dropped.
+    unsafe {
+        let this = slf.cast::<PatternMatcher>();
+        if !(*this).matcher.is_null() {
+            drop(Box::from_raw((*this).matcher));
+        }
+        Py_XDECREF((*this).patterns);
+        let tp = Py_TYPE(slf);
+        let free: freefunc = mem::transmute(PyType_GetSlot(tp, Py_tp_free));
+        free(slf.cast::<c_void>());
+        // Instances of heap types own a reference to their type.
+        Py_DECREF(tp.cast::<PyObject>());
+    }
+}
+
+/// Module initialisation, called once per process at `import qsgw_detect`.
+///
+/// # Safety
+///
+/// Only the Python import system may call this, with the GIL held.
+#[no_mangle]
+#[allow(non_snake_case)]
+pub unsafe extern "C" fn PyInit_qsgw_detect() -> *mut PyObject {
+    // The method table and module definition must outlive the module, so they
+    // are leaked; this runs once.
+    let methods = Box::leak(Box::new([
+        PyMethodDef {
+            ml_name: c"find".as_ptr(),
+            ml_meth: PyMethodDefPointer {
+                PyCFunction: pattern_matcher_find,
+            },
+            ml_flags: METH_O,
+            ml_doc: c"find($self, haystack, /)\n--\n\nReturn the first pattern found in haystack, or None."
+                .as_ptr(),
+        },
+        PyMethodDef::zeroed(),
+    ]));
+    let mut slots = [
+        PyType_Slot {
+            slot: Py_tp_new,
+            pfunc: pattern_matcher_new as *mut c_void,
+        },
+        PyType_Slot {
+            slot: Py_tp_dealloc,
+            pfunc: pattern_matcher_dealloc as *mut c_void,
+        },
+        PyType_Slot {
+            slot: Py_tp_methods,
+            pfunc: methods.as_mut_ptr().cast::<c_void>(),
+        },
+        PyType_Slot {
+            slot: Py_tp_doc,
+            pfunc: c"PatternMatcher(patterns)\n--\n\nASCII case-insensitive matcher over a fixed set of patterns."
+                .as_ptr() as *mut c_void,
+        },
+        PyType_Slot::default(),
+    ];
+    let mut spec = PyType_Spec {
+        name: c"qsgw_detect.PatternMatcher".as_ptr(),
+        basicsize: mem::size_of::<PatternMatcher>() as c_int,
+        itemsize: 0,
+        flags: (Py_TPFLAGS_DEFAULT | Py_TPFLAGS_IMMUTABLETYPE) as c_uint,
+        slots: slots.as_mut_ptr(),
+    };
+    let module_def = Box::leak(Box::new(PyModuleDef {
+        m_base: PyModuleDef_HEAD_INIT,
+        m_name: c"qsgw_detect".as_ptr(),
+        m_doc: c"Native user-agent pattern matching for the QSGW AI engine.".as_ptr(),
+        m_size: -1,
+        m_methods: ptr::null_mut(),
+        m_slots: ptr::null_mut(),
+        m_traverse: None,
+        m_clear: None,
+        m_free: None,
+    }));
+
+    // SAFETY: called by the import system with the GIL held.
+    unsafe {
+        let module = PyModule_Create(module_def);
+        if module.is_null() {
+            return ptr::null_mut();
+        }
+        let tp = PyType_FromSpec(&mut spec);
+        if tp.is_null() || PyModule_AddObjectRef(module, c"PatternMatcher".as_ptr(), tp) < 0 {
+            Py_XDECREF(tp);
+            Py_DECREF(module);
+            return ptr::null_mut();
+        }
+        Py_DECREF(tp);
+        module
+    }
+}
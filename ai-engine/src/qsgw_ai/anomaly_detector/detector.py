@@ -6,19 +6,47 @@ cipher suite manipulation, or abnormal handshake behaviour.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from enum import Enum
-
-
-class AnomalyType(str, Enum):
-    QUANTUM_DOWNGRADE = "QUANTUM_DOWNGRADE"
-    CIPHER_MANIPULATION = "CIPHER_MANIPULATION"
-    ABNORMAL_HANDSHAKE = "ABNORMAL_HANDSHAKE"
-    TRAFFIC_SPIKE = "TRAFFIC_SPIKE"
-    UNUSUAL_SOURCE = "UNUSUAL_SOURCE"
-
-
-@dataclass
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Literal
+
+import numpy as np
+from mypy_extensions import mypyc_attr
+from pydantic import GetJsonSchemaHandler
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import CoreSchema
+
+# Weak cipher primitives (RC4, DES, 3DES, MD5, SHA1) matched in a single pass.
+_WEAK_RE = re.compile(r"RC4|3DES|DES|MD5|SHA1")
+# Bit assigned to each weak primitive in TrafficSample.cipher_weak_flags.
+_WEAK_BITS = {"RC4": 1 << 0, "DES": 1 << 1, "3DES": 1 << 2, "MD5": 1 << 3, "SHA1": 1 << 4}
+_OLD_TLS = frozenset({"1.0", "1.1"})
+
+
+def weak_cipher_flags(cipher_suite: str) -> int:
+    """Return the bitmask of weak primitives found in a cipher suite name."""
+    flags = 0
+    for match in _WEAK_RE.finditer(cipher_suite):
+        flags |= _WEAK_BITS[match.group()]
+    return flags
+
+
+# Plain string constants rather than an Enum, so results serialize as-is.
+AnomalyType = Literal[
+    "QUANTUM_DOWNGRADE",
+    "CIPHER_MANIPULATION",
+    "ABNORMAL_HANDSHAKE",
+    "TRAFFIC_SPIKE",
+    "UNUSUAL_SOURCE",
+]
+
+
+# Kept a regular Python class under mypyc: Pydantic validates request bodies
+# into it and needs the standard dataclass machinery. Frozen so that the
+# derived cipher_weak_flags cannot go stale after the cipher suite changes.
+@mypyc_attr(native_class=False)
+@dataclass(slots=True, frozen=True)
 class TrafficSample:
     source_ip: str
     cipher_suite: str
@@ -27,15 +55,94 @@ class TrafficSample:
     handshake_duration_ms: float
     is_pqc: bool
     path: str = "/"
-
-
-@dataclass
+    # Derived once at ingest so the detector never rescans the cipher suite.
+    cipher_weak_flags: int = field(init=False, default=0)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "cipher_weak_flags", weak_cipher_flags(self.cipher_suite))
+
+    @classmethod
+    def __get_pydantic_json_schema__(
+        cls, core_schema: CoreSchema, handler: GetJsonSchemaHandler
+    ) -> JsonSchemaValue:
+        # cipher_weak_flags is not a request field, so it is left out of the
+        # published API schema. Done here rather than with SkipJsonSchema
+        # because mypyc drops Annotated metadata from compiled annotations.
+        json_schema = handler.resolve_ref_schema(handler(core_schema))
+        json_schema["properties"].pop("cipher_weak_flags", None)
+        return json_schema
+
+
+# %-style description templates per anomaly type, filled from
+# AnomalyResult.details with a single PyUnicode_Format call.
+_DESCRIPTIONS: dict[AnomalyType | None, str] = {
+    "QUANTUM_DOWNGRADE": "Potential quantum downgrade: %s on TLS %s",
+    "TRAFFIC_SPIKE": "Traffic spike: %.0f req/min from %s",
+    "ABNORMAL_HANDSHAKE": "Abnormal handshake duration: %.0fms",
+    None: "Normal traffic",
+}
+
+
+@dataclass(slots=True, frozen=True)
 class AnomalyResult:
     is_anomaly: bool
     anomaly_type: AnomalyType | None
     severity: str  # CRITICAL, HIGH, MEDIUM, LOW
     confidence: float  # 0.0 - 1.0
-    description: str
+    details: tuple[object, ...] = ()  # raw values for the description
+
+    @property
+    def description(self) -> str:
+        """Human-readable description, formatted only when requested."""
+        template = _DESCRIPTIONS.get(self.anomaly_type)
+        if template is None:
+            return self.anomaly_type or ""
+        return template % self.details
+
+
+_NORMAL = AnomalyResult(
+    is_anomaly=False,
+    anomaly_type=None,
+    severity="LOW",
+    confidence=0.0,
+)
+
+# Column layout consumed by AnomalyDetector.analyze_batch, one row per sample.
+BATCH_DTYPE = np.dtype([
+    ("request_rate_rpm", np.float64),
+    ("handshake_duration_ms", np.float64),
+    ("tls_version_code", np.int8),
+    ("cipher_flags", np.uint8),  # TrafficSample.cipher_weak_flags
+])
+
+# Codes returned by analyze_batch, indexing into this tuple.
+BATCH_ANOMALY_TYPES: tuple[AnomalyType | None, ...] = (
+    None,
+    "QUANTUM_DOWNGRADE",
+    "TRAFFIC_SPIKE",
+    "ABNORMAL_HANDSHAKE",
+)
+
+# Unrecognised versions encode as modern, matching the scalar downgrade rule.
+_TLS_VERSION_CODES = {"1.0": 0, "1.1": 1, "1.2": 2, "1.3": 3}
+_MODERN_TLS_CODE = 3
+_MIN_SAFE_TLS_CODE = 2
+
+
+def encode_batch(samples: Iterable[TrafficSample]) -> np.ndarray:
+    """Pack samples into a BATCH_DTYPE array for analyze_batch."""
+    return np.array(
+        [
+            (
+                s.request_rate_rpm,
+                s.handshake_duration_ms,
+                _TLS_VERSION_CODES.get(s.tls_version, _MODERN_TLS_CODE),
+                s.cipher_weak_flags,
+            )
+            for s in samples
+        ],
+        dtype=BATCH_DTYPE,
+    )
 
 
 class AnomalyDetector:
@@ -56,10 +163,10 @@ class AnomalyDetector:
         if self._is_downgrade(sample):
             return AnomalyResult(
                 is_anomaly=True,
-                anomaly_type=AnomalyType.QUANTUM_DOWNGRADE,
+                anomaly_type="QUANTUM_DOWNGRADE",
                 severity="CRITICAL",
                 confidence=0.9,
-                description=f"Potential quantum downgrade: {sample.cipher_suite} on TLS {sample.tls_version}",
+                details=(sample.cipher_suite, sample.tls_version),
             )
 
         # Check for traffic spike
@@ -67,34 +174,35 @@ class AnomalyDetector:
             severity = "HIGH" if sample.request_rate_rpm > self.max_request_rate * 3 else "MEDIUM"
             return AnomalyResult(
                 is_anomaly=True,
-                anomaly_type=AnomalyType.TRAFFIC_SPIKE,
+                anomaly_type="TRAFFIC_SPIKE",
                 severity=severity,
                 confidence=0.85,
-                description=f"Traffic spike: {sample.request_rate_rpm:.0f} req/min from {sample.source_ip}",
+                details=(sample.request_rate_rpm, sample.source_ip),
             )
 
         # Check for abnormal handshake
         if sample.handshake_duration_ms > self.max_handshake_ms:
             return AnomalyResult(
                 is_anomaly=True,
-                anomaly_type=AnomalyType.ABNORMAL_HANDSHAKE,
+                anomaly_type="ABNORMAL_HANDSHAKE",
                 severity="MEDIUM",
                 confidence=0.7,
-                description=f"Abnormal handshake duration: {sample.handshake_duration_ms:.0f}ms",
+                details=(sample.handshake_duration_ms,),
             )
 
-        return AnomalyResult(
-            is_anomaly=False,
-            anomaly_type=None,
-            severity="LOW",
-            confidence=0.0,
-            description="Normal traffic",
-        )
+        return _NORMAL
+
+    def analyze_batch(self, samples: np.ndarray) -> np.ndarray:
+        """Evaluate the rules of analyze() over a BATCH_DTYPE array at once.
+
+        Returns an int8 array of indexes into BATCH_ANOMALY_TYPES (0 = normal).
+        Callers needing full results can run analyze() on the flagged rows only.
+        """
+        downgrade = (samples["cipher_flags"] != 0) | (samples["tls_version_code"] < _MIN_SAFE_TLS_CODE)
+        spike = samples["request_rate_rpm"] > self.max_request_rate
+        abnormal = samples["handshake_duration_ms"] > self.max_handshake_ms
+        # np.select picks the first matching condition, preserving rule priority.
+        return np.select([downgrade, spike, abnormal], [1, 2, 3], 0).astype(np.int8)
 
     def _is_downgrade(self, sample: TrafficSample) -> bool:
-        weak_ciphers = ["RC4", "DES", "3DES", "MD5", "SHA1"]
-        if any(c in sample.cipher_suite for c in weak_ciphers):
-            return True
-        if sample.tls_version in ("1.0", "1.1"):
-            return True
-        return False
+        return bool(sample.cipher_weak_flags) or sample.tls_version in _OLD_TLS
@@ -2,39 +2,42 @@
 
 from __future__ import annotations
 
-from fastapi import FastAPI
-from pydantic import BaseModel
+from dataclasses import dataclass
+from typing import Annotated
+
+import msgspec
+from fastapi import APIRouter, Body, FastAPI
 
 from qsgw_ai.anomaly_detector import AnomalyDetector
 from qsgw_ai.anomaly_detector.detector import TrafficSample
+from qsgw_ai.api.middleware import EmptyUserAgentShortCircuit
+from qsgw_ai.api.routing import MsgspecRoute
 from qsgw_ai.bot_detector import BotDetector
 from qsgw_ai.bot_detector.detector import RequestFingerprint
 
+# Handlers only do in-memory CPU work, so they are declared ``async`` to run
+# inline on the event loop instead of being dispatched to the threadpool.
 app = FastAPI(title="QSGW AI Engine", version="0.1.0")
+# Detection routes parse their bodies with msgspec instead of Pydantic.
+detection = APIRouter(route_class=MsgspecRoute)
 
 _anomaly = AnomalyDetector()
 _bot = BotDetector()
 
+# Upper bound on items accepted by the batch endpoints.
+MAX_BATCH_SIZE = 1000
+
 
 @app.get("/health")
-def health() -> dict[str, str]:
+async def health() -> dict[str, str]:
     return {"status": "ok", "service": "qsgw-ai"}
 
 
 # ---------- Anomaly Detection ----------
 
 
-class TrafficSampleInput(BaseModel):
-    source_ip: str
-    cipher_suite: str
-    tls_version: str
-    request_rate_rpm: float
-    handshake_duration_ms: float
-    is_pqc: bool
-    path: str = "/"
-
-
-class AnomalyResponse(BaseModel):
+@dataclass(slots=True)
+class AnomalyResponse:
     is_anomaly: bool
     anomaly_type: str | None
     severity: str
@@ -42,58 +45,45 @@ class AnomalyResponse(BaseModel):
     description: str
 
 
-@app.post("/api/v1/analyze-traffic", response_model=AnomalyResponse)
-def analyze_traffic(req: TrafficSampleInput) -> AnomalyResponse:
-    sample = TrafficSample(
-        source_ip=req.source_ip,
-        cipher_suite=req.cipher_suite,
-        tls_version=req.tls_version,
-        request_rate_rpm=req.request_rate_rpm,
-        handshake_duration_ms=req.handshake_duration_ms,
-        is_pqc=req.is_pqc,
-        path=req.path,
-    )
+# Request bodies are validated straight into the detectors' input dataclasses,
+# so each request allocates its input once instead of copying a BaseModel.
+def _analyze(sample: TrafficSample) -> AnomalyResponse:
     result = _anomaly.analyze(sample)
     return AnomalyResponse(
         is_anomaly=result.is_anomaly,
-        anomaly_type=result.anomaly_type.value if result.anomaly_type else None,
+        anomaly_type=result.anomaly_type,
         severity=result.severity,
         confidence=result.confidence,
         description=result.description,
     )
 
 
-# ---------- Bot Detection ----------
+@detection.post("/api/v1/analyze-traffic", response_model=AnomalyResponse)
+async def analyze_traffic(req: TrafficSample) -> AnomalyResponse:
+    return _analyze(req)
+
 
+@detection.post("/api/v1/analyze-traffic/batch", response_model=list[AnomalyResponse])
+async def analyze_traffic_batch(
+    reqs: Annotated[list[TrafficSample], Body(max_length=MAX_BATCH_SIZE)],
+) -> list[AnomalyResponse]:
+    # Detection takes microseconds per sample, so a plain loop beats fanning
+    # out to tasks or threads.
+    return [_analyze(req) for req in reqs]
 
-class BotFingerprintInput(BaseModel):
-    source_ip: str
-    user_agent: str
-    path: str
-    request_rate_rpm: float
-    unique_paths_per_minute: int
-    avg_response_time_ms: float
-    has_valid_session: bool
 
+# ---------- Bot Detection ----------
 
-class BotResponse(BaseModel):
+
+@dataclass(slots=True)
+class BotResponse:
     is_bot: bool
     confidence: float
     bot_category: str
     description: str
 
 
-@app.post("/api/v1/detect-bot", response_model=BotResponse)
-def detect_bot(req: BotFingerprintInput) -> BotResponse:
-    fp = RequestFingerprint(
-        source_ip=req.source_ip,
-        user_agent=req.user_agent,
-        path=req.path,
-        request_rate_rpm=req.request_rate_rpm,
-        unique_paths_per_minute=req.unique_paths_per_minute,
-        avg_response_time_ms=req.avg_response_time_ms,
-        has_valid_session=req.has_valid_session,
-    )
+def _detect(fp: RequestFingerprint) -> BotResponse:
     result = _bot.detect(fp)
     return BotResponse(
         is_bot=result.is_bot,
@@ -101,3 +91,38 @@ def detect_bot(req: BotFingerprintInput) -> BotResponse:
         bot_category=result.bot_category,
         description=result.description,
     )
+
+
+@detection.post("/api/v1/detect-bot", response_model=BotResponse)
+async def detect_bot(req: RequestFingerprint) -> BotResponse:
+    return _detect(req)
+
+
+@detection.post("/api/v1/detect-bot/batch", response_model=list[BotResponse])
+async def detect_bot_batch(
+    reqs: Annotated[list[RequestFingerprint], Body(max_length=MAX_BATCH_SIZE)],
+) -> list[BotResponse]:
+    return [_detect(req) for req in reqs]
+
+
+app.include_router(detection)
+
+
+# An empty user agent always gets the same verdict, whatever the other fields,
+# so those requests are answered before validation and routing.
+_EMPTY_UA_RESPONSE = _detect(
+    RequestFingerprint(
+        source_ip="",
+        user_agent="",
+        path="/",
+        request_rate_rpm=0.0,
+        unique_paths_per_minute=0,
+        avg_response_time_ms=0.0,
+        has_valid_session=False,
+    )
+)
+app.add_middleware(
+    EmptyUserAgentShortCircuit,
+    path="/api/v1/detect-bot",
+    response_body=msgspec.json.encode(_EMPTY_UA_RESPONSE),
+)
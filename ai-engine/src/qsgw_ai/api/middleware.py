@@ -0,0 +1,63 @@
+"""ASGI middleware for the QSGW AI Engine."""
+
+from __future__ import annotations
+
+import orjson
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def _has_empty_user_agent(body: bytes) -> bool:
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return False
+    return isinstance(payload, dict) and payload.get("user_agent") == ""
+
+
+class EmptyUserAgentShortCircuit:
+    """Answer bot-detection requests with an empty user agent before routing.
+
+    An empty user agent is always classified the same way, so such requests
+    get a canned response without request validation or a detector call.
+    All other requests are forwarded with their body replayed unchanged.
+    Only bodies containing an empty JSON string are parsed here, so ordinary
+    requests are not decoded twice.
+    """
+
+    def __init__(self, app: ASGIApp, path: str, response_body: bytes) -> None:
+        self.app = app
+        self.path = path
+        self.response_body = response_body
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        chunks: list[bytes] = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                # Client disconnected before sending the whole body.
+                return
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        if b'""' in body and _has_empty_user_agent(body):
+            response = Response(self.response_body, media_type="application/json")
+            await response(scope, receive, send)
+            return
+
+        replayed = False
+
+        async def replay() -> Message:
+            nonlocal replayed
+            if replayed:
+                return await receive()
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app(scope, replay, send)
@@ -0,0 +1,89 @@
+"""msgspec-backed request parsing for the QSGW AI Engine."""
+
+from __future__ import annotations
+
+import inspect
+from collections.abc import Callable, Coroutine
+from typing import Annotated, Any, get_args, get_origin, get_type_hints
+
+import annotated_types
+import msgspec
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+def _msgspec_type(annotation: Any) -> Any:
+    """Translate a FastAPI body annotation into a type msgspec can decode.
+
+    ``Body(max_length=...)`` is carried over as ``msgspec.Meta``; other FastAPI
+    parameter metadata only affects the OpenAPI schema and is dropped.
+    """
+    if get_origin(annotation) is not Annotated:
+        return annotation
+    base, *extras = get_args(annotation)
+    for extra in extras:
+        for constraint in getattr(extra, "metadata", ()):
+            if isinstance(constraint, annotated_types.MaxLen):
+                return Annotated[base, msgspec.Meta(max_length=constraint.max_length)]
+    return base
+
+
+class MsgspecRoute(APIRoute):
+    """Route that decodes and encodes JSON bodies with msgspec.
+
+    The fast path applies to ``async def`` endpoints whose only input is a
+    single body parameter of a msgspec-supported type (the detector
+    dataclasses, or lists of them) and that return a msgspec-encodable value.
+    msgspec validates while decoding in one pass, skipping Pydantic on the
+    request path; the declared types still drive the OpenAPI schema.
+
+    Decoding is strict, so the fast path only accepts bodies whose JSON types
+    already match the declared fields. A body msgspec rejects, whether it is
+    invalid or merely needs coercion (numeric strings, ``"yes"`` for a bool,
+    and so on), is handed to the default FastAPI handler, so Pydantic decides
+    what is accepted and reports the same errors as before. Any other route,
+    including one with dependencies or path/query/header/cookie parameters,
+    always uses the default handler so none of them are skipped.
+    """
+
+    def _is_plain_body_route(self) -> bool:
+        dependant = self.dependant
+        return (
+            len(dependant.body_params) == 1
+            and not dependant.path_params
+            and not dependant.query_params
+            and not dependant.header_params
+            and not dependant.cookie_params
+            and not dependant.dependencies
+            and dependant.request_param_name is None
+            and dependant.websocket_param_name is None
+            and dependant.http_connection_param_name is None
+            and dependant.response_param_name is None
+            and dependant.background_tasks_param_name is None
+            and dependant.security_scopes_param_name is None
+            and inspect.iscoroutinefunction(self.endpoint)
+        )
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        default_handler = super().get_route_handler()
+        if not self._is_plain_body_route():
+            return default_handler
+
+        param = self.dependant.body_params[0].name
+        hints = get_type_hints(self.endpoint, include_extras=True)
+        decoder = msgspec.json.Decoder(_msgspec_type(hints[param]))
+        encoder = msgspec.json.Encoder()
+        endpoint = self.endpoint
+        status_code = self.status_code or 200
+
+        async def handler(request: Request) -> Response:
+            try:
+                value = decoder.decode(await request.body())
+            except msgspec.MsgspecError:
+                # The body is cached on the request, so Pydantic re-reads it.
+                return await default_handler(request)
+            result = await endpoint(**{param: value})
+            return Response(encoder.encode(result), status_code=status_code, media_type="application/json")
+
+        return handler
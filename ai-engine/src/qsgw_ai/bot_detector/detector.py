@@ -6,10 +6,38 @@ Identifies automated traffic that may be attempting to harvest encrypted data
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable
 from dataclasses import dataclass
+from typing import ClassVar
 
+import ahocorasick
+from mypy_extensions import mypyc_attr
 
-@dataclass
+try:
+    # Optional Rust extension built from ai-engine/native.
+    from qsgw_detect import PatternMatcher
+except ImportError:
+    PatternMatcher = None
+
+# Description templates, %-formatted on the hot path.
+_KNOWN_BOT_FMT = "Known bot user-agent (%s): %s"
+_HIGH_RATE_FMT = "High request rate: %.0f req/min"
+_PATH_DIVERSITY_FMT = "High path diversity: %d unique paths/min"
+
+# Bounds on the per-detector user-agent cache. Each entry holds the UA as its
+# key and, for bots, again in the description, so the entry count alone does
+# not bound memory; capping the cached UA length does (about 11 MB when full).
+# Real browser and crawler agents are well below the limit; longer ones are
+# scanned every time.
+_UA_CACHE_SIZE = 8192
+_MAX_CACHED_UA_LEN = 512
+
+
+# Kept a regular Python class under mypyc: Pydantic validates request bodies
+# into it and needs the standard dataclass machinery.
+@mypyc_attr(native_class=False)
+@dataclass(slots=True)
 class RequestFingerprint:
     source_ip: str
     user_agent: str
@@ -20,7 +48,7 @@ class RequestFingerprint:
     has_valid_session: bool
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BotDetectionResult:
     is_bot: bool
     confidence: float  # 0.0 - 1.0
@@ -28,9 +56,24 @@ class BotDetectionResult:
     description: str
 
 
+_LEGITIMATE = BotDetectionResult(
+    is_bot=False,
+    confidence=0.0,
+    bot_category="LEGITIMATE",
+    description="Traffic appears legitimate",
+)
+
+
 class BotDetector:
     """Heuristic-based bot detector."""
 
+    # ClassVar keeps this a class attribute under mypyc, which otherwise turns
+    # annotated class-body assignments into per-instance attribute defaults.
+    _KNOWN_BOT_AGENTS: ClassVar[tuple[str, ...]] = (
+        "bot", "crawler", "spider", "scraper", "curl", "wget", "python-requests",
+        "go-http-client", "java/", "libwww",
+    )
+
     def __init__(
         self,
         rate_threshold: float = 300.0,
@@ -38,31 +81,31 @@ class BotDetector:
     ):
         self.rate_threshold = rate_threshold
         self.path_diversity_threshold = path_diversity_threshold
-        self._known_bot_agents = [
-            "bot", "crawler", "spider", "scraper", "curl", "wget", "python-requests",
-            "go-http-client", "java/", "libwww",
-        ]
+        # All patterns are matched in a single pass over the user agent, by the
+        # native matcher when installed and pyahocorasick otherwise.
+        self._find_bot_pattern: Callable[[str], str | None]
+        if PatternMatcher is not None:
+            self._find_bot_pattern = PatternMatcher(list(self._KNOWN_BOT_AGENTS)).find
+        else:
+            self._ua_ac = ahocorasick.Automaton()
+            for pattern in self._KNOWN_BOT_AGENTS:
+                self._ua_ac.add_word(pattern, pattern)
+            self._ua_ac.make_automaton()
+            self._find_bot_pattern = self._find_bot_pattern_py
+        # User-agent verdicts depend only on the UA string, and real traffic is
+        # dominated by a small set of repeating agents, so memoize the finished
+        # results; repeats return the cached object without allocating. See
+        # _UA_CACHE_SIZE and _MAX_CACHED_UA_LEN for the memory bound.
+        self._classify_ua = functools.lru_cache(maxsize=_UA_CACHE_SIZE)(self._scan_user_agent)
 
     def detect(self, fingerprint: RequestFingerprint) -> BotDetectionResult:
-        # Check user agent against known bots
-        ua_lower = fingerprint.user_agent.lower()
-        for bot_pattern in self._known_bot_agents:
-            if bot_pattern in ua_lower:
-                return BotDetectionResult(
-                    is_bot=True,
-                    confidence=0.95,
-                    bot_category="CRAWLER",
-                    description=f"Known bot user-agent: {fingerprint.user_agent}",
-                )
-
-        # Empty or suspicious user agent
-        if not fingerprint.user_agent or len(fingerprint.user_agent) < 10:
-            return BotDetectionResult(
-                is_bot=True,
-                confidence=0.8,
-                bot_category="UNKNOWN",
-                description="Missing or suspiciously short user-agent",
-            )
+        user_agent = fingerprint.user_agent
+        if len(user_agent) <= _MAX_CACHED_UA_LEN:
+            ua_result = self._classify_ua(user_agent)
+        else:
+            ua_result = self._scan_user_agent(user_agent)
+        if ua_result is not None:
+            return ua_result
 
         # High request rate
         if fingerprint.request_rate_rpm > self.rate_threshold:
@@ -71,7 +114,7 @@ class BotDetector:
                 is_bot=True,
                 confidence=0.85,
                 bot_category=category,
-                description=f"High request rate: {fingerprint.request_rate_rpm:.0f} req/min",
+                description=_HIGH_RATE_FMT % fingerprint.request_rate_rpm,
             )
 
         # High path diversity (scanning behaviour)
@@ -80,12 +123,34 @@ class BotDetector:
                 is_bot=True,
                 confidence=0.75,
                 bot_category="SCRAPER",
-                description=f"High path diversity: {fingerprint.unique_paths_per_minute} unique paths/min",
+                description=_PATH_DIVERSITY_FMT % fingerprint.unique_paths_per_minute,
             )
 
-        return BotDetectionResult(
-            is_bot=False,
-            confidence=0.0,
-            bot_category="LEGITIMATE",
-            description="Traffic appears legitimate",
-        )
+        return _LEGITIMATE
+
+    def _scan_user_agent(self, user_agent: str) -> BotDetectionResult | None:
+        """Classify a user agent on its own, or return None if it looks legitimate."""
+        # Check user agent against known bots
+        pattern = self._find_bot_pattern(user_agent)
+        if pattern is not None:
+            return BotDetectionResult(
+                is_bot=True,
+                confidence=0.95,
+                bot_category="CRAWLER",
+                description=_KNOWN_BOT_FMT % (pattern, user_agent),
+            )
+
+        # Empty or suspicious user agent
+        if not user_agent or len(user_agent) < 10:
+            return BotDetectionResult(
+                is_bot=True,
+                confidence=0.8,
+                bot_category="UNKNOWN",
+                description="Missing or suspiciously short user-agent",
+            )
+
+        return None
+
+    def _find_bot_pattern_py(self, user_agent: str) -> str | None:
+        hit = next(self._ua_ac.iter(user_agent.lower()), None)
+        return hit[1] if hit is not None else None
@@ -1,5 +1,15 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
 from qsgw_ai.anomaly_detector import AnomalyDetector
-from qsgw_ai.anomaly_detector.detector import TrafficSample
+from qsgw_ai.anomaly_detector.detector import (
+    BATCH_ANOMALY_TYPES,
+    TrafficSample,
+    encode_batch,
+    weak_cipher_flags,
+)
 
 
 def test_normal_traffic():
@@ -29,7 +39,7 @@ def test_quantum_downgrade():
     )
     result = detector.analyze(sample)
     assert result.is_anomaly
-    assert result.anomaly_type.value == "QUANTUM_DOWNGRADE"
+    assert result.anomaly_type == "QUANTUM_DOWNGRADE"
     assert result.severity == "CRITICAL"
 
 
@@ -45,7 +55,7 @@ def test_traffic_spike():
     )
     result = detector.analyze(sample)
     assert result.is_anomaly
-    assert result.anomaly_type.value == "TRAFFIC_SPIKE"
+    assert result.anomaly_type == "TRAFFIC_SPIKE"
 
 
 def test_abnormal_handshake():
@@ -60,4 +70,78 @@ def test_abnormal_handshake():
     )
     result = detector.analyze(sample)
     assert result.is_anomaly
-    assert result.anomaly_type.value == "ABNORMAL_HANDSHAKE"
+    assert result.anomaly_type == "ABNORMAL_HANDSHAKE"
+
+
+def test_weak_cipher_on_tls13_is_downgrade():
+    detector = AnomalyDetector()
+    sample = TrafficSample(
+        source_ip="10.0.0.1",
+        cipher_suite="TLS_RSA_WITH_3DES_EDE_CBC_SHA",
+        tls_version="1.3",
+        request_rate_rpm=10.0,
+        handshake_duration_ms=50.0,
+        is_pqc=False,
+    )
+    result = detector.analyze(sample)
+    assert result.anomaly_type == "QUANTUM_DOWNGRADE"
+
+
+def test_description_is_formatted_from_details():
+    detector = AnomalyDetector(max_request_rate=100.0)
+    sample = TrafficSample(
+        source_ip="10.0.0.7",
+        cipher_suite="TLS_AES_256_GCM_SHA384",
+        tls_version="1.3",
+        request_rate_rpm=450.4,
+        handshake_duration_ms=50.0,
+        is_pqc=False,
+    )
+    result = detector.analyze(sample)
+    assert result.description == "Traffic spike: 450 req/min from 10.0.0.7"
+
+
+def test_normal_traffic_result_is_shared():
+    detector = AnomalyDetector()
+    sample = TrafficSample(
+        source_ip="10.0.0.1",
+        cipher_suite="TLS_ML-KEM-768_AES_256_GCM",
+        tls_version="1.3",
+        request_rate_rpm=100.0,
+        handshake_duration_ms=50.0,
+        is_pqc=True,
+    )
+    assert detector.analyze(sample) is detector.analyze(sample)
+    assert detector.analyze(sample).description == "Normal traffic"
+
+
+def test_analyze_batch_matches_scalar_rules():
+    detector = AnomalyDetector(max_request_rate=100.0, max_handshake_ms=1000.0)
+    samples = [
+        TrafficSample("10.0.0.1", "TLS_ML-KEM-768_AES_256_GCM", "1.3", 50.0, 50.0, True),
+        TrafficSample("10.0.0.2", "TLS_RSA_WITH_RC4_128_SHA", "1.2", 50.0, 50.0, False),
+        TrafficSample("10.0.0.3", "TLS_AES_256_GCM_SHA384", "1.1", 50.0, 50.0, False),
+        TrafficSample("10.0.0.4", "TLS_AES_256_GCM_SHA384", "1.3", 500.0, 5000.0, False),
+        TrafficSample("10.0.0.5", "TLS_AES_256_GCM_SHA384", "1.3", 50.0, 5000.0, False),
+    ]
+    codes = detector.analyze_batch(encode_batch(samples))
+    assert codes.dtype == np.int8
+    assert [BATCH_ANOMALY_TYPES[c] for c in codes] == [
+        detector.analyze(s).anomaly_type for s in samples
+    ]
+
+
+def test_weak_cipher_flags():
+    assert weak_cipher_flags("TLS_AES_256_GCM_SHA384") == 0
+    assert weak_cipher_flags("TLS_RSA_WITH_RC4_128_SHA1") == 0b10001
+    assert weak_cipher_flags("TLS_RSA_WITH_3DES_EDE_CBC_MD5") == 0b01100
+
+
+def test_cipher_flags_cannot_go_stale():
+    sample = TrafficSample("10.0.0.1", "TLS_AES_256_GCM_SHA384", "1.3", 10.0, 50.0, False)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        sample.cipher_suite = "TLS_RSA_WITH_RC4_128_SHA"
+
+    weak = dataclasses.replace(sample, cipher_suite="TLS_RSA_WITH_RC4_128_SHA")
+    assert weak.cipher_weak_flags == weak_cipher_flags("TLS_RSA_WITH_RC4_128_SHA")
+    assert AnomalyDetector().analyze(weak).anomaly_type == "QUANTUM_DOWNGRADE"
@@ -0,0 +1,169 @@
+from fastapi.testclient import TestClient
+
+from qsgw_ai.api.app import app
+
+client = TestClient(app)
+
+
+def test_health():
+    resp = client.get("/health")
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "ok"
+
+
+def test_analyze_traffic():
+    resp = client.post(
+        "/api/v1/analyze-traffic",
+        json={
+            "source_ip": "10.0.0.1",
+            "cipher_suite": "TLS_RSA_WITH_RC4_128_SHA",
+            "tls_version": "1.0",
+            "request_rate_rpm": 10.0,
+            "handshake_duration_ms": 50.0,
+            "is_pqc": False,
+        },
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["is_anomaly"]
+    assert body["anomaly_type"] == "QUANTUM_DOWNGRADE"
+    assert body["severity"] == "CRITICAL"
+
+
+def test_detect_bot():
+    resp = client.post(
+        "/api/v1/detect-bot",
+        json={
+            "source_ip": "10.0.0.1",
+            "user_agent": "Googlebot/2.1",
+            "path": "/",
+            "request_rate_rpm": 50.0,
+            "unique_paths_per_minute": 10,
+            "avg_response_time_ms": 100.0,
+            "has_valid_session": False,
+        },
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["is_bot"]
+    assert body["bot_category"] == "CRAWLER"
+
+
+def test_detect_bot_batch():
+    base = {
+        "source_ip": "10.0.0.1",
+        "path": "/",
+        "request_rate_rpm": 20.0,
+        "unique_paths_per_minute": 5,
+        "avg_response_time_ms": 100.0,
+        "has_valid_session": True,
+    }
+    resp = client.post(
+        "/api/v1/detect-bot/batch",
+        json=[
+            {**base, "user_agent": "Googlebot/2.1"},
+            {**base, "user_agent": "Mozilla/5.0 (Windows NT 10.0) Chrome/120"},
+        ],
+    )
+    assert resp.status_code == 200
+    assert [r["bot_category"] for r in resp.json()] == ["CRAWLER", "LEGITIMATE"]
+
+
+def test_analyze_traffic_batch_rejects_oversized_batch():
+    sample = {
+        "source_ip": "10.0.0.1",
+        "cipher_suite": "TLS_AES_256_GCM_SHA384",
+        "tls_version": "1.3",
+        "request_rate_rpm": 10.0,
+        "handshake_duration_ms": 50.0,
+        "is_pqc": True,
+    }
+    resp = client.post("/api/v1/analyze-traffic/batch", json=[sample])
+    assert resp.status_code == 200
+    assert not resp.json()[0]["is_anomaly"]
+
+    resp = client.post("/api/v1/analyze-traffic/batch", json=[sample] * 1001)
+    assert resp.status_code == 422
+
+
+def test_detect_bot_empty_user_agent_short_circuit():
+    resp = client.post("/api/v1/detect-bot", json={"user_agent": ""})
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "is_bot": True,
+        "confidence": 0.8,
+        "bot_category": "UNKNOWN",
+        "description": "Missing or suspiciously short user-agent",
+    }
+
+
+def test_detect_bot_invalid_body_still_validated():
+    resp = client.post("/api/v1/detect-bot", content=b"not json")
+    assert resp.status_code == 422
+    resp = client.post("/api/v1/detect-bot", json={"user_agent": "Googlebot/2.1"})
+    assert resp.status_code == 422
+
+
+def test_detect_bot_rejects_wrong_field_type():
+    resp = client.post(
+        "/api/v1/detect-bot",
+        json={
+            "source_ip": "10.0.0.1",
+            "user_agent": "Mozilla/5.0 (Windows NT 10.0) Chrome/120",
+            "path": "/",
+            "request_rate_rpm": "fast",
+            "unique_paths_per_minute": 10,
+            "avg_response_time_ms": 100.0,
+            "has_valid_session": False,
+        },
+    )
+    assert resp.status_code == 422
+    error = resp.json()["detail"][0]
+    assert error["loc"] == ["body", "request_rate_rpm"]
+    assert error["type"] == "float_parsing"
+    assert error["input"] == "fast"
+
+
+def test_detect_bot_coerces_like_pydantic():
+    resp = client.post(
+        "/api/v1/detect-bot",
+        json={
+            "source_ip": "10.0.0.1",
+            "user_agent": "Mozilla/5.0 (Windows NT 10.0) Chrome/120",
+            "path": "/",
+            "request_rate_rpm": " 5 ",
+            "unique_paths_per_minute": " 10",
+            "avg_response_time_ms": "100",
+            "has_valid_session": "yes",
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.json()["bot_category"] == "LEGITIMATE"
+
+
+def test_batch_missing_field_reports_item_location():
+    resp = client.post("/api/v1/detect-bot/batch", json=[{"source_ip": "10.0.0.1"}])
+    assert resp.status_code == 422
+    error = resp.json()["detail"][0]
+    assert error["type"] == "missing"
+    assert error["loc"] == ["body", 0, "user_agent"]
+
+
+def test_derived_fields_not_in_request_schema():
+    schema = app.openapi()["components"]["schemas"]["TrafficSample"]
+    assert "cipher_weak_flags" not in schema["properties"]
+
+    # A client-supplied value is ignored; the flags are always derived.
+    resp = client.post(
+        "/api/v1/analyze-traffic",
+        json={
+            "source_ip": "10.0.0.1",
+            "cipher_suite": "TLS_RSA_WITH_RC4_128_MD5",
+            "tls_version": "1.3",
+            "request_rate_rpm": 10.0,
+            "handshake_duration_ms": 50.0,
+            "is_pqc": False,
+            "cipher_weak_flags": 0,
+        },
+    )
+    assert resp.json()["anomaly_type"] == "QUANTUM_DOWNGRADE"
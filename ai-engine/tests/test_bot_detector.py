@@ -1,4 +1,6 @@
-from qsgw_ai.bot_detector import BotDetector
+import pytest
+
+from qsgw_ai.bot_detector import BotDetector, detector as detector_module
 from qsgw_ai.bot_detector.detector import RequestFingerprint
 
 
@@ -64,3 +66,156 @@ def test_empty_user_agent():
     result = detector.detect(fp)
     assert result.is_bot
     assert result.bot_category == "UNKNOWN"
+
+
+def test_known_bot_agent_substring_match():
+    detector = BotDetector()
+    fp = RequestFingerprint(
+        source_ip="10.0.0.1",
+        user_agent="Mozilla/5.0 (compatible) Python-Requests/2.31",
+        path="/",
+        request_rate_rpm=5.0,
+        unique_paths_per_minute=1,
+        avg_response_time_ms=100.0,
+        has_valid_session=False,
+    )
+    result = detector.detect(fp)
+    assert result.is_bot
+    assert result.bot_category == "CRAWLER"
+    assert "python-requests" in result.description
+
+
+def test_user_agent_verdict_is_cached():
+    detector = BotDetector()
+    fp = RequestFingerprint(
+        source_ip="10.0.0.1",
+        user_agent="curl/8.4.0",
+        path="/",
+        request_rate_rpm=5.0,
+        unique_paths_per_minute=1,
+        avg_response_time_ms=100.0,
+        has_valid_session=False,
+    )
+    first = detector.detect(fp)
+    second = detector.detect(fp)
+    assert second is first
+    assert detector._classify_ua.cache_info().hits == 1
+
+
+def test_long_user_agent_is_not_cached():
+    detector = BotDetector()
+    fp = RequestFingerprint(
+        source_ip="10.0.0.1",
+        user_agent="curl/8.4.0 " + "x" * 1000,
+        path="/",
+        request_rate_rpm=5.0,
+        unique_paths_per_minute=1,
+        avg_response_time_ms=100.0,
+        has_valid_session=False,
+    )
+    assert detector.detect(fp).bot_category == "CRAWLER"
+    assert detector._classify_ua.cache_info().currsize == 0
+
+    fp.user_agent = fp.user_agent[:512]
+    assert detector.detect(fp).bot_category == "CRAWLER"
+    assert detector._classify_ua.cache_info().currsize == 1
+
+
+def test_path_diversity_description():
+    detector = BotDetector()
+    fp = RequestFingerprint(
+        source_ip="10.0.0.1",
+        user_agent="Mozilla/5.0 (X11; Linux x86_64) Firefox/125.0",
+        path="/admin",
+        request_rate_rpm=60.0,
+        unique_paths_per_minute=120,
+        avg_response_time_ms=80.0,
+        has_valid_session=False,
+    )
+    result = detector.detect(fp)
+    assert result.bot_category == "SCRAPER"
+    assert result.description == "High path diversity: 120 unique paths/min"
+
+
+def test_bot_token_after_browser_prefix():
+    # Bots commonly spoof a browser prefix; the whole user agent must be scanned.
+    detector = BotDetector()
+    fp = RequestFingerprint(
+        source_ip="10.0.0.1",
+        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko; compatible; bingbot/2.0)",
+        path="/",
+        request_rate_rpm=5.0,
+        unique_paths_per_minute=1,
+        avg_response_time_ms=100.0,
+        has_valid_session=False,
+    )
+    result = detector.detect(fp)
+    assert result.is_bot
+    assert result.bot_category == "CRAWLER"
+
+
+class _StubPatternMatcher:
+    """Pure-Python stand-in for ``qsgw_detect.PatternMatcher``."""
+
+    def __init__(self, patterns):
+        self.patterns = patterns
+        self.calls = []
+
+    def find(self, haystack):
+        self.calls.append(haystack)
+        lowered = haystack.lower()
+        ends = [(lowered.find(p) + len(p), p) for p in self.patterns if p in lowered]
+        return min(ends)[1] if ends else None
+
+
+def test_native_pattern_matcher_is_used_when_available(monkeypatch):
+    monkeypatch.setattr(detector_module, "PatternMatcher", _StubPatternMatcher)
+    detector = BotDetector()
+    matcher = detector._find_bot_pattern.__self__
+    assert isinstance(matcher, _StubPatternMatcher)
+    assert matcher.patterns == list(BotDetector._KNOWN_BOT_AGENTS)
+
+    fp = RequestFingerprint(
+        source_ip="10.0.0.1",
+        user_agent="Mozilla/5.0 (compatible) Python-Requests/2.31",
+        path="/",
+        request_rate_rpm=5.0,
+        unique_paths_per_minute=1,
+        avg_response_time_ms=100.0,
+        has_valid_session=False,
+    )
+    result = detector.detect(fp)
+    assert result.is_bot
+    assert result.bot_category == "CRAWLER"
+    assert "python-requests" in result.description
+    assert matcher.calls == [fp.user_agent]
+
+    fp.user_agent = "Mozilla/5.0 (X11; Linux x86_64) Firefox/125.0"
+    assert not detector.detect(fp).is_bot
+
+
+def test_native_pattern_matcher_agrees_with_fallback(monkeypatch):
+    # Runs against the real extension when it is installed
+    # (make test-python-native) and is skipped otherwise.
+    qsgw_detect = pytest.importorskip("qsgw_detect")
+    native = BotDetector()
+    assert isinstance(native._find_bot_pattern.__self__, qsgw_detect.PatternMatcher)
+    monkeypatch.setattr(detector_module, "PatternMatcher", None)
+    fallback = BotDetector()
+
+    user_agents = [
+        "",
+        "Googlebot/2.1 (+http://www.google.com/bot.html)",
+        "CURL/8.4.0",
+        "python-requests bot",
+        "curl python-requests",
+        "Go-http-client/2.0",
+        "Java/17.0.2",
+        "libwww-perl/6.72",
+        "Mozilla/5.0 (X11; Linux x86_64) Firefox/125.0",
+        "Mozilla/5.0 (Windows NT 10.0) Chrome/120 Ünïcødé Spider",
+        "\udc80wget/1.21",
+    ]
+    for user_agent in user_agents:
+        assert native._find_bot_pattern(user_agent) == fallback._find_bot_pattern(user_agent), user_agent
@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException
+from fastapi.testclient import TestClient
+
+from qsgw_ai.api.routing import MsgspecRoute
+
+
+@dataclass
+class Item:
+    name: str
+
+
+@dataclass
+class Reading:
+    active: bool
+    count: int
+    rate: float
+
+
+def _require_auth(authorization: str = Header(default="")) -> None:
+    if not authorization:
+        raise HTTPException(status_code=401)
+
+
+router = APIRouter(route_class=MsgspecRoute)
+
+
+@router.post("/plain")
+async def plain(item: Item) -> dict[str, str]:
+    return {"name": item.name}
+
+
+@router.post("/guarded", dependencies=[Depends(_require_auth)])
+async def guarded(item: Item) -> dict[str, str]:
+    return {"name": item.name}
+
+
+@router.post("/query")
+async def with_query(item: Item, limit: int = 5) -> dict[str, int]:
+    return {"limit": limit}
+
+
+@router.post("/sync")
+def sync_endpoint(item: Item) -> dict[str, str]:
+    return {"name": item.name}
+
+
+@router.post("/reading")
+async def reading(body: Reading) -> Reading:
+    return body
+
+
+# The same endpoint on FastAPI's default route class, as a reference.
+reference = APIRouter()
+reference.add_api_route("/reading", reading, methods=["POST"])
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+reference_client = TestClient(FastAPI(routes=reference.routes))
+
+
+def test_only_plain_body_routes_take_fast_path():
+    fast = {route.path: route._is_plain_body_route() for route in router.routes}
+    assert fast == {
+        "/plain": True,
+        "/guarded": False,
+        "/query": False,
+        "/sync": False,
+        "/reading": True,
+    }
+
+
+def test_plain_body_route():
+    resp = client.post("/plain", json={"name": "a"})
+    assert resp.status_code == 200
+    assert resp.json() == {"name": "a"}
+
+
+def test_dependencies_still_run():
+    assert client.post("/guarded", json={"name": "a"}).status_code == 401
+    resp = client.post("/guarded", json={"name": "a"}, headers={"Authorization": "Bearer t"})
+    assert resp.status_code == 200
+
+
+def test_query_params_still_parsed():
+    assert client.post("/query?limit=9", json={"name": "a"}).json() == {"limit": 9}
+
+
+def test_sync_endpoint_uses_default_handler():
+    assert client.post("/sync", json={"name": "a"}).json() == {"name": "a"}
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"active": true, "count": 10, "rate": 5.5}',
+        # Coercions Pydantic accepts and strict msgspec does not.
+        b'{"active": "yes", "count": 10, "rate": 5}',
+        b'{"active": "on", "count": " 10", "rate": " 5 "}',
+        b'{"active": "t", "count": true, "rate": "5"}',
+        b'{"active": 1, "count": 10.0, "rate": 5}',
+        # Invalid bodies, which must report Pydantic's errors.
+        b'{"active": "maybe", "count": "ten", "rate": "fast"}',
+        b'{"active": true, "count": 10}',
+        b'{"active": true, "count": 10.5, "rate": 5}',
+        b'[]',
+        b"not json",
+        b"",
+    ],
+)
+def test_fast_path_matches_default_handler(body):
+    resp = client.post("/reading", content=body, headers={"Content-Type": "application/json"})
+    expected = reference_client.post("/reading", content=body, headers={"Content-Type": "application/json"})
+    assert (resp.status_code, resp.json()) == (expected.status_code, expected.json())